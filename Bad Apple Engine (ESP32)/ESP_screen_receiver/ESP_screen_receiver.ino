@@ -9,6 +9,13 @@ const int FRAME_W = 128;
 const int FRAME_H = 96;
 const int BYTES_PER_FRAME = (FRAME_W * FRAME_H) / 8;
 
+// Host keeps up to this many frames in flight before waiting for an ACK
+const int MAX_FRAMES_IN_FLIGHT = 4;
+
+// Every frame is preceded by this 2-byte header (FRAME_SYNC in player.py)
+const uint8_t SYNC_0 = 0xA5;
+const uint8_t SYNC_1 = 0x5A;
+
 uint8_t frameBuf[BYTES_PER_FRAME];
 
 void drawFrameFast(const uint8_t *data) {
@@ -35,6 +42,8 @@ void setup() {
   pinMode(BACKLIGHT_PIN, OUTPUT);
   digitalWrite(BACKLIGHT_PIN, HIGH);
 
+  // Buffer every in-flight frame while the previous one is being drawn
+  Serial.setRxBufferSize((BYTES_PER_FRAME + 2) * MAX_FRAMES_IN_FLIGHT + 64);
   Serial.begin(921600);
 
   tft.init();
@@ -47,9 +56,19 @@ void setup() {
   tft.println("Waiting for frames...");
 }
 
+// Skip bytes until the sync header; false if the line goes quiet first
+bool waitForSync() {
+  uint8_t prev = 0, b;
+  while (Serial.readBytes(&b, 1) == 1) {
+    if (prev == SYNC_0 && b == SYNC_1) return true;
+    prev = b;
+  }
+  return false;
+}
+
 void loop() {
-  // Flush leftover serial bytes to ensure alignment
-  while (Serial.available()) Serial.read();
+  // Frames are pipelined, so never flush: realign on the sync header instead
+  if (!waitForSync()) return;
 
   // Read EXACTLY one frame
   int bytesRead = Serial.readBytes(frameBuf, BYTES_PER_FRAME);
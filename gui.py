@@ -3,6 +3,9 @@ import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 from player import BadApplePlayer
+from functools import lru_cache
+import cv2
+import numpy as np
 import time
 
 SERIAL_PORT = "COM4"   # <-- change this to your actual ESP32 COM port
@@ -18,6 +21,19 @@ def format_time(seconds: float) -> str:
     return f"{m:02d}:{s:02d}"
 
 
+def show_image(label: tk.Label, pil_img: Image.Image):
+    """Show pil_img on label, reusing its PhotoImage while size and mode match."""
+    key = (pil_img.size, pil_img.mode)
+    if label.img_ref is None or getattr(label, "img_key", None) != key:
+        # First frame, or the image changed shape: Tk needs a new PhotoImage
+        label.img_ref = ImageTk.PhotoImage(pil_img)
+        label.img_key = key
+        label.configure(image=label.img_ref)
+    else:
+        # paste() updates the pixels in place, no new Tk photo allocation
+        label.img_ref.paste(pil_img)
+
+
 def main():
     # --- Create player engine ---
     player = BadApplePlayer(
@@ -49,6 +65,18 @@ def main():
     preview_canvas.pack()
     preview_canvas.img_ref = None  # keep ref to avoid GC
 
+    # Scale preview x3 for visibility
+    PREVIEW_SCALE = 3
+
+    @lru_cache(maxsize=64)
+    def scaled_preview(idx: int) -> np.ndarray:
+        # Upscaled once per frame index and reused by later redraws; a full
+        # precomputed table would cost ~110 KB per frame (~360 MB total).
+        frame_img = player.get_preview_frame(idx)  # numpy (H x W)
+        scaled = frame_img.repeat(PREVIEW_SCALE, axis=0).repeat(PREVIEW_SCALE, axis=1)
+        scaled.setflags(write=False)  # shared by later ticks, never draw on it
+        return scaled
+
     # Skip indicator (for +5s, -10s, etc.)
     skip_indicator = {"text": None, "timestamp": 0.0}
 
@@ -59,6 +87,7 @@ def main():
             text = f"{int(seconds)}s"
         skip_indicator["text"] = text
         skip_indicator["timestamp"] = time.time()
+        request_redraw()
 
     # ================================================================
     # MIDDLE: CONTROLS (play/pause, speed, seek)
@@ -66,9 +95,21 @@ def main():
     btn_frame = ttk.Frame(root)
     btn_frame.pack(pady=5)
 
-    ttk.Button(btn_frame, text="Play",   command=player.play).grid(row=0, column=0, padx=5)
-    ttk.Button(btn_frame, text="Pause",  command=player.pause).grid(row=0, column=1, padx=5)
-    ttk.Button(btn_frame, text="Rewind", command=player.rewind).grid(row=0, column=2, padx=5)
+    def on_play():
+        player.play()
+        wake_ui()
+
+    def on_pause():
+        player.pause()
+        wake_ui()
+
+    def on_rewind():
+        player.rewind()
+        wake_ui()
+
+    ttk.Button(btn_frame, text="Play",   command=on_play).grid(row=0, column=0, padx=5)
+    ttk.Button(btn_frame, text="Pause",  command=on_pause).grid(row=0, column=1, padx=5)
+    ttk.Button(btn_frame, text="Rewind", command=on_rewind).grid(row=0, column=2, padx=5)
 
     # ---------- YouTube-style Speed Dropdown ----------
     ttk.Label(root, text="Playback Speed").pack()
@@ -111,6 +152,7 @@ def main():
             except ValueError:
                 idx = 0
             player.seek(idx)
+            request_redraw()
 
     seek_scale = ttk.Scale(
         root,
@@ -129,6 +171,7 @@ def main():
         is_seeking["value"] = False
         idx = seek_var.get()
         player.seek(idx)
+        request_redraw()
 
     seek_scale.bind("<ButtonPress-1>", on_seek_press)
     seek_scale.bind("<ButtonRelease-1>", on_seek_release)
@@ -147,6 +190,7 @@ def main():
     # ---------- Keyboard Shortcuts ----------
     def on_space(event=None):
         player.toggle_play()
+        wake_ui()
 
     def on_left(event=None):
         seek_relative(-SEEK_SMALL)
@@ -212,6 +256,9 @@ def main():
     virtual_label.pack()
     virtual_label.img_ref = None  # keep ref
 
+    # Composite buffer for the virtual TFT, allocated once
+    tft_buf = np.zeros((VIRTUAL_H, VIRTUAL_W), dtype=np.uint8)
+
     # Viewport within the virtual TFT where the video is drawn
     viewport = {
         "x": 80,   # initial position
@@ -298,6 +345,8 @@ def main():
             viewport["w"] = new_w
             viewport["h"] = new_h
 
+        request_redraw()
+
     def on_virtual_mouse_up(event):
         drag_state["mode"] = None
 
@@ -308,9 +357,21 @@ def main():
     # ================================================================
     # UI UPDATE LOOP
     # ================================================================
-    def update_ui():
-        idx = player.get_current_frame()
-        playing = player.is_playing()
+    # What is currently on screen, so unchanged ticks can skip the redraw
+    last_drawn = {"idx": None, "viewport": None, "skip_visible": False, "playing": False}
+    redraw_pending = {"value": False}
+
+    def request_redraw():
+        # Coalesce bursts of events (e.g. mouse drags) into one idle redraw
+        if not redraw_pending["value"]:
+            redraw_pending["value"] = True
+            root.after_idle(redraw)
+
+    def redraw(state=None):
+        redraw_pending["value"] = False
+        # state is (idx, playing) when the caller already took a snapshot
+        idx, playing = state if state is not None else player.snapshot()
+        frame_img = player.get_preview_frame(idx)  # numpy (H x W), shared by both panes
 
         # Time display
         cur_t = idx / player.base_fps
@@ -323,82 +384,105 @@ def main():
         if not is_seeking["value"]:
             seek_var.set(idx)
 
+        # Skip indicator is shown if recent (<0.5s)
+        skip_dt = time.time() - skip_indicator["timestamp"]
+        skip_visible = bool(skip_indicator["text"]) and skip_dt < 0.5
+        cur_viewport = (viewport["x"], viewport["y"], viewport["w"], viewport["h"])
+
+        # Redraw the preview while the indicator is up and once more to clear it
+        dirty_preview = (
+            idx != last_drawn["idx"] or skip_visible or last_drawn["skip_visible"]
+        )
+        dirty_tft = idx != last_drawn["idx"] or cur_viewport != last_drawn["viewport"]
+
         # ----------------- FULL PREVIEW (top) -----------------
-        try:
-            frame_img = player.get_preview_frame(idx)  # numpy (H x W)
-            pil_img = Image.fromarray(frame_img)
-
-            # Scale preview x3 for visibility
-            scale = 3
-            pil_img = pil_img.resize(
-                (player.frame_w * scale, player.frame_h * scale),
-                Image.NEAREST
-            )
-
-            # Draw skip indicator if recent (<0.5s)
-            dt = time.time() - skip_indicator["timestamp"]
-            if skip_indicator["text"] and dt < 0.5:
-                draw = ImageDraw.Draw(pil_img)
-                text = skip_indicator["text"]
-                W, H = pil_img.size
-                font = ImageFont.load_default()
-                # Pillow 10+: use textbbox instead of textsize
-                bbox = draw.textbbox((0, 0), text, font=font)
-                w = bbox[2] - bbox[0]
-                h = bbox[3] - bbox[1]
-                draw.text(
-                    ((W - w) // 2, (H - h) // 2),
-                    text,
-                    fill=255,
-                    font=font
-                )
-
-            tk_img = ImageTk.PhotoImage(pil_img)
-            preview_canvas.configure(image=tk_img)
-            preview_canvas.img_ref = tk_img
-        except Exception:
-            pass  # avoid crashing UI for any preview issue
+        if dirty_preview:
+            try:
+                pil_img = Image.fromarray(scaled_preview(idx))
+
+                if skip_visible:
+                    draw = ImageDraw.Draw(pil_img)
+                    text = skip_indicator["text"]
+                    W, H = pil_img.size
+                    font = ImageFont.load_default()
+                    # Pillow 10+: use textbbox instead of textsize
+                    bbox = draw.textbbox((0, 0), text, font=font)
+                    w = bbox[2] - bbox[0]
+                    h = bbox[3] - bbox[1]
+                    draw.text(
+                        ((W - w) // 2, (H - h) // 2),
+                        text,
+                        fill=255,
+                        font=font
+                    )
+
+                show_image(preview_canvas, pil_img)
+            except Exception:
+                pass  # avoid crashing UI for any preview issue
 
         # ----------------- VIRTUAL TFT (bottom) -----------------
-        try:
-            frame_img = player.get_preview_frame(idx)  # same frame
-            # base "screen" image
-            tft_img = Image.new("L", (VIRTUAL_W, VIRTUAL_H), 0)  # black background
-
-            # scale video frame to viewport size
-            vw, vh = int(viewport["w"]), int(viewport["h"])
-            if vw > 0 and vh > 0:
-                vid_pil = Image.fromarray(frame_img)
-                vid_scaled = vid_pil.resize((vw, vh), Image.NEAREST)
-                tft_img.paste(vid_scaled, (int(viewport["x"]), int(viewport["y"])))
-
-            # draw viewport border + resize handle
-            draw = ImageDraw.Draw(tft_img)
-            vx, vy, vw, vh = viewport["x"], viewport["y"], viewport["w"], viewport["h"]
-            # rectangle border
-            draw.rectangle(
-                [vx, vy, vx + vw - 1, vy + vh - 1],
-                outline=255,
-                width=1
-            )
-            # resize handle (small filled square in bottom-right corner)
-            handle_x0 = vx + vw - RESIZE_HANDLE_SIZE
-            handle_y0 = vy + vh - RESIZE_HANDLE_SIZE
-            draw.rectangle(
-                [handle_x0, handle_y0, handle_x0 + RESIZE_HANDLE_SIZE - 1, handle_y0 + RESIZE_HANDLE_SIZE - 1],
-                fill=255
-            )
-
-            # convert to RGB for Tk
-            tft_img_rgb = tft_img.convert("RGB")
-            tk_tft = ImageTk.PhotoImage(tft_img_rgb)
-            virtual_label.configure(image=tk_tft)
-            virtual_label.img_ref = tk_tft
-
-        except Exception:
-            pass
-
-        root.after(100, update_ui)
+        if dirty_tft:
+            try:
+                # base "screen" image, reused every redraw
+                tft_buf[:] = 0  # black background
+
+                # scale video frame to viewport size
+                vx, vy = int(viewport["x"]), int(viewport["y"])
+                vw, vh = int(viewport["w"]), int(viewport["h"])
+                if vw > 0 and vh > 0:
+                    tft_buf[vy:vy + vh, vx:vx + vw] = cv2.resize(
+                        frame_img, (vw, vh), interpolation=cv2.INTER_NEAREST
+                    )
+
+                    # viewport border
+                    tft_buf[vy, vx:vx + vw] = 255
+                    tft_buf[vy + vh - 1, vx:vx + vw] = 255
+                    tft_buf[vy:vy + vh, vx] = 255
+                    tft_buf[vy:vy + vh, vx + vw - 1] = 255
+
+                    # resize handle (small filled square in bottom-right corner)
+                    handle_x0 = max(vx, vx + vw - RESIZE_HANDLE_SIZE)
+                    handle_y0 = max(vy, vy + vh - RESIZE_HANDLE_SIZE)
+                    tft_buf[handle_y0:vy + vh, handle_x0:vx + vw] = 255
+
+                # ImageTk takes L-mode images directly, no RGB copy needed
+                show_image(virtual_label, Image.fromarray(tft_buf, "L"))
+            except Exception:
+                pass
+
+        last_drawn["idx"] = idx
+        last_drawn["viewport"] = cur_viewport
+        last_drawn["skip_visible"] = skip_visible
+        last_drawn["playing"] = playing
+
+    UI_INTERVAL_MS = 100       # while playing or something changed
+    UI_IDLE_INTERVAL_MS = 500  # paused and nothing changed
+    ui_tick = {"after_id": None}
+
+    def update_ui():
+        idx, playing = player.snapshot()
+
+        # Paused with nothing new to show: poll slowly instead of redrawing
+        idle = (
+            last_drawn["idx"] is not None
+            and not playing
+            and not player.frame_changed.is_set()
+            and not last_drawn["playing"]
+            and not last_drawn["skip_visible"]
+        )
+        if not idle:
+            player.frame_changed.clear()
+            redraw((idx, playing))
+
+        interval = UI_IDLE_INTERVAL_MS if idle else UI_INTERVAL_MS
+        ui_tick["after_id"] = root.after(interval, update_ui)
+
+    def wake_ui():
+        # Play state changed: redraw now and go back to the fast tick
+        if ui_tick["after_id"] is not None:
+            root.after_cancel(ui_tick["after_id"])
+        redraw()
+        ui_tick["after_id"] = root.after(UI_INTERVAL_MS, update_ui)
 
     # ---------- Quit Handler ----------
     def on_quit():
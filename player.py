@@ -1,11 +1,40 @@
 # player.py
+import ctypes
 import glob
+import os
+import queue
+import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import serial
 import numpy as np
 
+try:
+    from numba import njit  # optional JIT for the packing kernel
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def _pack_kernel(img, out, w, h):
+        # Threshold (> 128) and pack 8 pixels per byte, MSB first
+        bytes_per_row = w // 8
+        for y in range(h):
+            for xb in range(bytes_per_row):
+                b = 0
+                for k in range(8):
+                    if img[y, xb * 8 + k] > 128:
+                        b |= 0x80 >> k
+                out[y * bytes_per_row + xb] = b
+else:
+    _pack_kernel = None
+
+# Sent before every frame; the ESP32 scans for it to stay aligned
+FRAME_SYNC = b"\xa5\x5a"
+
 
 class BadApplePlayer:
     def __init__(
@@ -17,6 +46,9 @@ class BadApplePlayer:
         frame_h: int = 96,
         base_fps: float = 15.0,
         loop_fps: float = 120.0,   # high-frequency loop for responsiveness
+        frames_cache: str = "frames.cache",
+        preview_cache: str = "preview.cache",
+        ack_window: int = 4,       # frames in flight before waiting for an ACK
     ):
         # Video & transmission settings
         self.frame_w = frame_w
@@ -27,22 +59,56 @@ class BadApplePlayer:
         self.baud = baud
         self.base_fps = base_fps
         self.loop_fps = loop_fps  # how often the loop runs
+        self.ack_window = max(1, ack_window)
 
         # State (protected by lock)
         self._lock = threading.Lock()
         self._playing = False
         self._stop_flag = False
 
-        # Timeline state (in seconds of video)
-        self._video_time_sec = 0.0        # current logical video time
+        # Set by the playback thread whenever it sends a new frame
+        self.frame_changed = threading.Event()
+
+        # Timeline state (in frames, advanced incrementally by the loop)
+        self._frame_idx = 0               # current logical frame
+        self._frame_accum = 0.0           # fraction of the next frame elapsed
         self._speed_multiplier = 1.0      # 1.0 = normal speed
 
-        # Open serial
-        self.ser = serial.Serial(self.serial_port, self.baud)
+        # Open serial. Short read timeout so the ACK reader can notice stop.
+        # Writes and ACK waits are bounded by the time a full ACK window takes
+        # on the wire (10 bits per byte) plus slack, so a stalled ESP32 can't
+        # block the playback thread.
+        frame_tx_sec = (len(FRAME_SYNC) + self.bytes_per_frame) * 10 / self.baud
+        self._io_timeout = 0.05 + self.ack_window * frame_tx_sec
+        self.ser = serial.Serial(
+            self.serial_port,
+            self.baud,
+            timeout=0.05,
+            write_timeout=self._io_timeout,
+        )
         time.sleep(1.0)  # give ESP32 time to reset
+        self.ser.reset_input_buffer()  # drop boot messages so they aren't read as ACKs
+
+        # ACKs (0xAA) are collected by a reader thread so writes never block
+        # on a round-trip; only ack_window frames may be unacknowledged.
+        self._ack_queue = queue.Queue()
+
+        # Reused send buffer, one sync header + frame per row
+        self._send_buf = np.empty(
+            (self.ack_window, len(FRAME_SYNC) + self.bytes_per_frame), dtype=np.uint8
+        )
+        self._send_buf[:, :len(FRAME_SYNC)] = np.frombuffer(FRAME_SYNC, dtype=np.uint8)
+        self._inflight = 0
+        self._last_ack_time = time.perf_counter()
+        self._last_write_time = 0.0
+        self._resync_until = 0.0  # no sends until then after a partial write
+        self._ack_thread = threading.Thread(target=self._ack_reader, daemon=True)
+        self._ack_thread.start()
 
         # Load frames (preview + packed)
-        self.frames, self.preview_frames = self._load_all_frames(frames_glob)
+        self.frames_cache = frames_cache
+        self.preview_cache = preview_cache
+        self.frames, self.preview_frames = self._load_cached_frames(frames_glob)
         self.total_frames = len(self.frames)
         print(f"[Player] Loaded {self.total_frames} frames")
 
@@ -54,61 +120,138 @@ class BadApplePlayer:
     # Load & pack all frames
     # ------------------------------------------------------------------
 
-    def _load_all_frames(self, pattern: str):
+    def _load_cached_frames(self, pattern: str):
+        """
+        Return (frames, preview_frames) as (N x bytes_per_frame) and
+        (N x H x W) uint8 arrays, memory-mapped from the on-disk caches
+        when they match the frame set, otherwise decoded from the PNGs
+        and written to the caches for next time.
+        """
         paths = sorted(glob.glob(pattern))
         if not paths:
             raise SystemExit(f"No frames found with pattern: {pattern}")
 
-        packed_frames = []
-        preview_frames = []
+        n = len(paths)
+        newest_png = max(os.path.getmtime(p) for p in paths)
+        if (
+            self._cache_valid(self.frames_cache, n, n * self.bytes_per_frame, newest_png)
+            and self._cache_valid(self.preview_cache, n, n * self.frame_w * self.frame_h, newest_png)
+        ):
+            frames = np.memmap(
+                self.frames_cache, dtype=np.uint8, mode="r",
+                offset=self._CACHE_HEADER_SIZE,
+                shape=(n, self.bytes_per_frame),
+            )
+            previews = np.memmap(
+                self.preview_cache, dtype=np.uint8, mode="r",
+                offset=self._CACHE_HEADER_SIZE,
+                shape=(n, self.frame_h, self.frame_w),
+            )
+            print(f"[Player] Using cached frames from {self.frames_cache}")
+            return frames, previews
+
+        frames, previews = self._load_all_frames(paths)
 
-        for i, path in enumerate(paths):
-            img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
-            img = cv2.resize(img, (self.frame_w, self.frame_h))
-
-            # Store preview (uint8 image)
-            preview_frames.append(img.copy())
-
-            # Store packed 1-bit frame for ESP32
-            packed_frames.append(self._pack_img(img))
-
-            if i % 200 == 0:
-                print(f"[Player] Packed {i}/{len(paths)} frames")
+        try:
+            self._write_cache(self.frames_cache, frames)
+            self._write_cache(self.preview_cache, previews)
+        except OSError as e:
+            print(f"[Player] Could not write frame cache: {e}")
+
+        return frames, previews
+
+    # Cache files start with (N, W, H) as little-endian uint32
+    _CACHE_HEADER_SIZE = 12
+
+    def _cache_header(self, n: int) -> bytes:
+        return np.array([n, self.frame_w, self.frame_h], dtype="<u4").tobytes()
+
+    def _cache_valid(self, path: str, n: int, data_size: int, newest_png: float) -> bool:
+        """True if path was written for this frame set and is newer than every PNG."""
+        if not os.path.isfile(path):
+            return False
+        if os.path.getsize(path) != self._CACHE_HEADER_SIZE + data_size:
+            return False
+        if os.path.getmtime(path) < newest_png:
+            return False  # frames were re-extracted after the cache was written
+        with open(path, "rb") as f:
+            return f.read(self._CACHE_HEADER_SIZE) == self._cache_header(n)
+
+    def _write_cache(self, path: str, arr: np.ndarray):
+        with open(path, "wb") as f:
+            f.write(self._cache_header(len(arr)))
+            arr.tofile(f)
+
+    def _load_all_frames(self, paths):
+        # One contiguous array each instead of a list of per-frame buffers
+        n = len(paths)
+        packed_frames = np.empty((n, self.bytes_per_frame), dtype=np.uint8)
+        preview_frames = np.empty((n, self.frame_h, self.frame_w), dtype=np.uint8)
+
+        def load(i: int):
+            # Each call fills its own rows, so threads never share a buffer
+            self._load_one(paths[i], preview_frames[i], packed_frames[i])
+
+        # PNG decode, resize and packing all release the GIL, so a thread pool
+        # scales with cores. map() yields in path order for the progress log.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for i, _ in enumerate(ex.map(load, range(n))):
+                if i % 200 == 0:
+                    print(f"[Player] Packed {i}/{n} frames")
 
         return packed_frames, preview_frames
 
-    def _pack_img(self, img: np.ndarray) -> bytes:
-        # Threshold to 1-bit
-        _, bw = cv2.threshold(img, 128, 255, cv2.THRESH_BINARY)
-        out = bytearray(self.bytes_per_frame)
+    def _load_one(self, path: str, preview: np.ndarray, packed: np.ndarray):
+        """Load one PNG into its preview row and pack it into its frame row."""
+        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        # Frames extracted per the README are already frame_w x frame_h
+        if img.shape != (self.frame_h, self.frame_w):
+            img = cv2.resize(img, (self.frame_w, self.frame_h))
+        preview[:] = img
+        self._pack_img(preview, packed)
 
-        for y in range(self.frame_h):
-            row_offset = y * (self.frame_w // 8)
-            for x in range(self.frame_w):
-                byte_i = row_offset + (x >> 3)
-                if bw[y, x] > 0:
-                    out[byte_i] |= (1 << (7 - (x & 7)))
+    def _pack_img(self, img: np.ndarray, out: np.ndarray):
+        """Pack img into out (bytes_per_frame uint8), 1 bit per pixel."""
+        if _pack_kernel is not None:
+            _pack_kernel(img, out, self.frame_w, self.frame_h)
+            return
 
-        return bytes(out)
+        # Threshold to 1-bit (pixel > 128) and pack 8 pixels per byte,
+        # MSB first (drawFrameFast reads 0x80 >> (x & 7)).
+        # packbits is MSB-first by default; passing bitorder needs NumPy >= 1.17.
+        out[:] = np.packbits(img > 128, axis=-1).reshape(-1)
 
     # ------------------------------------------------------------------
     # Main playback loop (timeline-driven)
     # ------------------------------------------------------------------
 
     def _loop(self):
+        # Windows sleeps in ~15.6 ms ticks by default, which would turn the
+        # 120 Hz loop into ~64 Hz; ask for 1 ms timer resolution for as long
+        # as the playback thread runs (paused included)
+        if sys.platform == "win32":
+            ctypes.windll.winmm.timeBeginPeriod(1)
+
+        try:
+            self._run_timeline()
+        finally:
+            with self._lock:
+                self._stop_flag = True  # also stops the ACK reader on errors
+
+            # The timer change is system-wide, so undo it even on errors
+            if sys.platform == "win32":
+                ctypes.windll.winmm.timeEndPeriod(1)
+
+            self._ack_thread.join(timeout=1.0)
+            self.ser.close()
+            print("[Player] Stopped and serial closed.")
+
+    def _run_timeline(self):
         loop_interval = 1.0 / self.loop_fps
         last_real_time = time.perf_counter()
         last_sent_frame = -1
 
         while True:
-            # Check stop
-            with self._lock:
-                if self._stop_flag:
-                    break
-                playing = self._playing
-                speed = self._speed_multiplier
-                video_time = self._video_time_sec
-
             now = time.perf_counter()
             dt = now - last_real_time
             last_real_time = now
@@ -117,59 +260,150 @@ class BadApplePlayer:
             if dt > 0.25:
                 dt = 0.25
 
-            # Update video timeline if playing
-            if playing:
-                video_time += dt * speed
-                # Loop video time if we reach the end
-                total_video_time = self.total_frames / self.base_fps
-                if total_video_time > 0:
-                    # Wrap around
-                    while video_time >= total_video_time:
-                        video_time -= total_video_time
-                    while video_time < 0:
-                        video_time += total_video_time
-
-                with self._lock:
-                    self._video_time_sec = video_time
-            else:
-                # Not playing -> video_time remains constant
-                pass
-
-            # Compute which frame we *should* be on
-            frame_idx = int(video_time * self.base_fps)
-            if self.total_frames > 0:
-                # Just in case int rounding goes off by one
-                frame_idx = max(0, min(frame_idx, self.total_frames - 1))
-            else:
-                frame_idx = 0
+            # Check stop and advance the timeline in one critical section, so
+            # a seek from the GUI can't land between the read and the write
+            with self._lock:
+                if self._stop_flag:
+                    break
+                playing = self._playing
+                if playing and self.total_frames > 0:
+                    # Advance by whole frames and carry the remainder, so the
+                    # frame index never drifts from repeated float multiplies
+                    self._frame_accum += dt * self._speed_multiplier * self.base_fps
+                    whole = int(self._frame_accum)
+                    self._frame_accum -= whole
+                    # Loop the video when we reach the end
+                    self._frame_idx = (self._frame_idx + whole) % self.total_frames
+                frame_idx = self._frame_idx
 
             # Only send frame when it changes
             if frame_idx != last_sent_frame:
-                self._send_frame(frame_idx)
-                last_sent_frame = frame_idx
+                behind = frame_idx - last_sent_frame
+                if playing and last_sent_frame >= 0 and 0 < behind <= self.ack_window:
+                    # Every frame due since the last send, in one write
+                    sent = self._send_frames(last_sent_frame + 1, frame_idx + 1)
+                else:
+                    # Seek, wrap-around or far behind: jump to the current frame
+                    sent = self._send_frame(frame_idx)
+                if sent:
+                    # Otherwise the next iteration tries again
+                    last_sent_frame = frame_idx
+                    self.frame_changed.set()
 
             time.sleep(loop_interval)
 
-        self.ser.close()
-        print("[Player] Stopped and serial closed.")
-
     # ------------------------------------------------------------------
     # Send one frame to ESP32
     # ------------------------------------------------------------------
 
-    def _send_frame(self, frame_index: int):
+    def _send_frame(self, frame_index: int) -> bool:
         if self.total_frames == 0:
-            return
+            return False
 
         frame_index = max(0, min(frame_index, self.total_frames - 1))
-        payload = self.frames[frame_index]
-        self.ser.write(payload)
+        return self._send_frames(frame_index, frame_index + 1)
+
+    # Longer than the sketch's 1 s Serial.readBytes timeout
+    _ACK_GIVE_UP_SEC = 1.5
+
+    def _send_frames(self, start: int, stop: int) -> bool:
+        """Send frames [start, stop) back-to-back in a single serial write.
+
+        Returns False if nothing was sent (window full, resyncing or a
+        serial error).
+        """
+        count = stop - start
+        if count <= 0 or count > self.ack_window:
+            return False
+        # Copy the frames in behind their sync headers; one write for the batch
+        batch = self._send_buf[:count]
+        batch[:, len(FRAME_SYNC):] = self.frames[start:stop]
+        payload = memoryview(batch).cast("B")
+
+        if self._resync_until:
+            if time.perf_counter() < self._resync_until:
+                return False
+            # The ESP32 has dropped the partial frame and ACKed the rest by
+            # now; any ACK still missing will never come
+            self._resync_until = 0.0
+            self._reset_window()
+
+        # Retire ACKs that have already arrived
+        while True:
+            try:
+                self._ack_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._retire_ack()
+
+        # Nothing written for longer than the sketch's read timeout: every
+        # earlier frame has been ACKed or flushed, so none is still in flight
+        if time.perf_counter() - self._last_write_time > self._ACK_GIVE_UP_SEC:
+            self._inflight = 0
+
+        # Sliding window: the ESP32 ACKs each frame, so wait until the whole
+        # batch fits in ack_window, but no longer than _io_timeout in total
+        deadline = time.perf_counter() + self._io_timeout
+        while self._inflight > 0 and self._inflight + count > self.ack_window:
+            if time.perf_counter() - self._last_ack_time > self._ACK_GIVE_UP_SEC:
+                # ESP32 silent past its read timeout: it has flushed any
+                # partial frame, so nothing in flight will be ACKed now
+                self._reset_window()
+                break
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Window still full: give up on this batch for now
+                return False
+            try:
+                self._ack_queue.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            self._retire_ack()
 
         try:
-            self.ser.read(1)  # wait for ACK (0xAA) from ESP32
+            if self._inflight == 0:
+                self._last_ack_time = time.perf_counter()  # silence starts now
+            self.ser.write(payload)
+            self._last_write_time = time.perf_counter()
+            self._inflight += count
+            return True
+        except serial.SerialTimeoutException:
+            # Part of the batch may already be on the wire, which would leave
+            # the ESP32 misaligned. Discard the rest and stay quiet past its
+            # read timeout so it drops the partial frame and realigns.
+            try:
+                self.ser.reset_output_buffer()
+            except Exception:
+                pass
+            self._resync_until = time.perf_counter() + self._ACK_GIVE_UP_SEC
         except Exception:
             # In case of serial glitch, don't crash the loop
             pass
+        return False
+
+    def _retire_ack(self):
+        self._last_ack_time = time.perf_counter()
+        if self._inflight > 0:
+            self._inflight -= 1
+
+    def _reset_window(self):
+        """Forget every in-flight frame and any ACK already queued for them."""
+        while True:
+            try:
+                self._ack_queue.get_nowait()
+            except queue.Empty:
+                break
+        self._inflight = 0
+
+    def _ack_reader(self):
+        """Collect ACK bytes (0xAA) from the ESP32 until the player stops."""
+        while not self._stop_flag:
+            try:
+                data = self.ser.read(1)
+            except Exception:
+                break
+            if data == b"\xaa":
+                self._ack_queue.put(data)
 
     # ------------------------------------------------------------------
     # Public API used by the GUI
@@ -191,15 +425,15 @@ class BadApplePlayer:
         self.seek(0)
 
     def seek(self, frame_index: int):
-        """Set the video time so the logical frame is frame_index."""
+        """Move the timeline to the start of frame_index."""
         if self.total_frames == 0:
             return
 
         frame_index = max(0, min(frame_index, self.total_frames - 1))
-        new_time = frame_index / self.base_fps
 
         with self._lock:
-            self._video_time_sec = new_time
+            self._frame_idx = frame_index
+            self._frame_accum = 0.0
         # Next loop iteration will see a different frame index and send it
 
     def set_speed(self, multiplier: float):
@@ -209,14 +443,12 @@ class BadApplePlayer:
     def get_current_frame(self) -> int:
         """Return the current logical frame index."""
         with self._lock:
-            video_time = self._video_time_sec
-
-        if self.total_frames == 0:
-            return 0
+            return self._frame_idx
 
-        idx = int(video_time * self.base_fps)
-        idx = max(0, min(idx, self.total_frames - 1))
-        return idx
+    def snapshot(self):
+        """Return (current frame index, playing) under a single lock."""
+        with self._lock:
+            return self._frame_idx, self._playing
 
     def get_preview_frame(self, frame_index: int):
         """Return grayscale numpy image (H x W) of given frame."""